@@ -0,0 +1,73 @@
+# Dictionary flattening shared by `Zendesk` and `ZDBC`.
+# Kept free of classes and third-party imports so it can be compiled on its own (e.g. `mypyc zdbcon/_flatten.py`).
+from operator import itemgetter
+
+FIELD_EVENT_EXCLUDED_KEYS = frozenset({'field_name'})
+_FIELD_ID_VALUE = itemgetter('id', 'value')
+
+def flatten_dict(d: dict, key: str | list[str]) -> dict:
+    """Recusively flattens a dictionary (dictionaries inside of dictionaries are also flattened).
+
+    Lists with dictionaries are turned into dicts with keys using `key`.
+
+    If `key` is a list, it attempts to use each item from the list in order as a key.
+
+    :param dict d: dictionary to be flattened
+    :param str | list[str] key: key or keys to be used in keying lists of dictionaries
+    :return dict: flatenned dictionary
+    """
+    return { k: flatten_dict_list(v, key) if isinstance(v, (list, dict)) else v for k, v in d.items() }
+
+
+def flatten_dict_list(dlist: list[dict], key: str | list[str]) -> dict:
+    """Flattens list of dictionaries recursively
+
+    :param list[dict] dlist: list of dictionaries
+    :param str | list[str] key: key(s) to be extrated from the dictionaries and turned into dict keys
+    :return dict: flattened dictionary
+    """
+    if isinstance(dlist, dict):
+        return flatten_dict(dlist, key)
+    if not isinstance(dlist, list) or (dlist and not isinstance(dlist[0], (list, dict))):
+        return dlist
+
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    first_key = keys[0]
+
+    flattened = {}
+    for d in dlist:
+        ck = first_key if first_key in d else next((k for k in keys[1:] if k in d), None)
+        flattened[d[ck]] = flatten_dict({k: v for k, v in d.items() if k != ck}, key)
+
+    return flattened
+
+
+def normalise_json(d: dict, prefix: str='', normalized: dict|None=None, sep: str='.') -> dict:
+    """Flattens nested dictionaries into a single level dictionary, joining keys with `sep`.
+
+    Pure-Python equivalent of `pd.json_normalize(d).iloc[0].to_dict()` for a single record.
+
+    :param dict d: nested dictionary
+    :param str prefix: prefix for the keys, used by the recursion, defaults to ''
+    :param dict | None normalized: dictionary the flattened keys are written into, used by the recursion, defaults to None
+    :param str sep: key separator, defaults to '.'
+    :return dict: single level dictionary
+    """
+    if normalized is None:
+        normalized = {}
+    for k, v in d.items():
+        if isinstance(v, dict):
+            normalise_json(v, f'{prefix}{k}{sep}', normalized, sep)
+        else:
+            normalized[f'{prefix}{k}'] = v
+    return normalized
+
+
+def normalized_fields(dlist: list[dict] | None) -> dict:
+    """Normalizes the Zendesk fields data (`custom_fields`, `fields`) into a dictionary of field ID to value.
+
+    :param list[dict] | None dlist: list of fields
+    :return dict: normalized (flattened) dictionary
+    """
+    if not dlist: return {}
+    return dict(map(_FIELD_ID_VALUE, dlist))
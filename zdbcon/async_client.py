@@ -0,0 +1,186 @@
+import asyncio
+import httpx
+import orjson
+from datetime import datetime
+from dateutil import tz
+from typing import AsyncGenerator
+
+
+AUDITS_PAGE_SIZE = 100
+
+
+def zendesk_client_kwargs(credentials: dict[str, str], max_connections=8) -> dict:
+    """Keyword arguments for an `httpx.Client`/`httpx.AsyncClient` for the Zendesk API.
+
+    :param dict[str, str] credentials: Zendesk API credentials (`email`, `token` and `subdomain`)
+    :param int max_connections: max number of pooled keep-alive connections, defaults to 8
+    :return dict: `base_url`, `auth` and `limits` keyword arguments
+    """
+    return dict(
+        base_url=f"https://{credentials['subdomain']}.zendesk.com",
+        auth=(f"{credentials['email']}/token", credentials['token']),
+        limits=httpx.Limits(max_keepalive_connections=max_connections, keepalive_expiry=30)
+    )
+
+
+def retry_delay(response: httpx.Response, attempt: int, max_retries: int) -> float | None:
+    """Seconds to wait before retrying a request, or None if `response` should not be retried.
+
+    Only `429` responses are retried, after the `Retry-After` header (or with exponential backoff), up to `max_retries` times.
+
+    :param httpx.Response response: response to the last attempt
+    :param int attempt: number of the last attempt, starting at 0
+    :param int max_retries: number of times to retry a rate limited request
+    :return float | None: delay in seconds
+    """
+    if response.status_code != 429 or attempt >= max_retries:
+        return None
+    return float(response.headers.get('Retry-After', 2 ** attempt))
+
+
+def audits_page_params(page: dict | None = None) -> dict | None:
+    """Query parameters for the next page of a ticket's audits, following Zendesk's cursor pagination.
+
+    :param dict | None page: last audits page, defaults to None for the first page
+    :return dict | None: query parameters, or None if there are no more pages
+    """
+    if page is None:
+        return {'page[size]': AUDITS_PAGE_SIZE}
+    if not page.get('meta', {}).get('has_more'):
+        return None
+    return {'page[size]': AUDITS_PAGE_SIZE, 'page[after]': page['meta']['after_cursor']}
+
+
+def zendesk_async_client(credentials: dict[str, str], max_connections=8) -> httpx.AsyncClient:
+    """Creates an `httpx.AsyncClient` for the Zendesk API, keeping up to `max_connections` connections alive.
+
+    :param dict[str, str] credentials: Zendesk API credentials (`email`, `token` and `subdomain`)
+    :param int max_connections: max number of pooled keep-alive connections, defaults to 8
+    :return httpx.AsyncClient: client with the Zendesk `base_url` and authentication set
+    """
+    return httpx.AsyncClient(**zendesk_client_kwargs(credentials, max_connections))
+
+
+async def get_json(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str, params: dict|None=None, max_retries=5) -> dict:
+    """GET request that returns the parsed JSON response.
+
+    Requests that get a `429` response are retried with exponential backoff (or the `Retry-After` header, if given).
+
+    :param httpx.AsyncClient client: client with the Zendesk `base_url` and authentication set
+    :param asyncio.Semaphore sem: semaphore that limits the number of concurrent requests
+    :param str url: endpoint path or absolute URL
+    :param dict | None params: query parameters, defaults to None
+    :param int max_retries: number of times to retry a rate limited request, defaults to 5
+    :return dict: response JSON, parsed with `orjson`
+    """
+    attempt = 0
+    while True:
+        async with sem:
+            response = await client.get(url, params=params)
+        delay = retry_delay(response, attempt, max_retries)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
+        attempt += 1
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def fetch_ticket_audits(client: httpx.AsyncClient, sem: asyncio.Semaphore, ticket_id: int) -> list[dict]:
+    """Fetches all audits for `ticket_id`, following Zendesk's cursor pagination.
+
+    :param httpx.AsyncClient client: client with the Zendesk `base_url` and authentication set
+    :param asyncio.Semaphore sem: semaphore that limits the number of concurrent requests
+    :param int ticket_id:
+    :return list[dict]: list of audit dictionaries
+    """
+    audits: list[dict] = []
+    params = audits_page_params()
+    while params is not None:
+        page = await get_json(client, sem, f'/api/v2/tickets/{ticket_id}/audits.json', params)
+        audits.extend(page['audits'])
+        params = audits_page_params(page)
+    return audits
+
+
+async def fetch_audits_batch(credentials: dict[str, str], ticket_ids: list[int], sem_limit=8) -> dict[int, list[dict]]:
+    """Fetches the audits for all `ticket_ids` concurrently.
+
+    The returned audit dictionaries can be passed to the `*_from` methods of `ZenChat` and `ZenSLA`.
+
+    :param dict[str, str] credentials: Zendesk API credentials (`email`, `token` and `subdomain`)
+    :param list[int] ticket_ids: IDs of the tickets
+    :param int sem_limit: max number of concurrent requests, defaults to 8
+    :return dict[int, list[dict]]: dictionary of ticket ID to list of audit dictionaries
+    """
+    sem = asyncio.Semaphore(sem_limit)
+    async with zendesk_async_client(credentials, sem_limit) as client:
+        results = await asyncio.gather(*(fetch_ticket_audits(client, sem, ticket_id) for ticket_id in ticket_ids))
+    return dict(zip(ticket_ids, results))
+
+
+SEARCH_PAGE_SIZE = 100
+SEARCH_MAX_RESULTS = 1000
+
+
+async def fetch_search_results(credentials: dict[str, str], params: dict, sem_limit=8) -> list[dict]:
+    """Fetches all results of a Zendesk search, requesting the result pages concurrently.
+
+    The first page is fetched on its own to read the total `count`. Zendesk returns at most `SEARCH_MAX_RESULTS` results per search,
+    so a search that matches more results raises instead of silently returning a truncated list.
+
+    :param dict[str, str] credentials: Zendesk API credentials (`email`, `token` and `subdomain`)
+    :param dict params: search query parameters (`query`, `sort_by`, `sort_order`)
+    :param int sem_limit: max number of concurrent requests, defaults to 8
+    :raises ValueError: if the search matches more than `SEARCH_MAX_RESULTS` results
+    :return list[dict]: search results, in the order returned by the API
+    """
+    sem = asyncio.Semaphore(sem_limit)
+    params = {**params, 'per_page': SEARCH_PAGE_SIZE}
+    async with zendesk_async_client(credentials, sem_limit) as client:
+        first = await get_json(client, sem, '/api/v2/search.json', params)
+        if first['count'] > SEARCH_MAX_RESULTS:
+            raise ValueError(f"Search matches {first['count']} results, over Zendesk's limit of {SEARCH_MAX_RESULTS}: narrow the query")
+        last_page = -(-first['count'] // SEARCH_PAGE_SIZE)
+        pages = await asyncio.gather(*(get_json(client, sem, '/api/v2/search.json', {**params, 'page': page}) for page in range(2, last_page + 1)))
+    return [result for page in (first, *pages) for result in page['results']]
+
+
+async def fetch_ticket(client: httpx.AsyncClient, sem: asyncio.Semaphore, ticket_id: int, include: list[str]) -> dict:
+    """Fetches ticket with `ticket_id` and its `include` side-loads, which are added as keys of the ticket dictionary.
+
+    :param httpx.AsyncClient client: client with the Zendesk `base_url` and authentication set
+    :param asyncio.Semaphore sem: semaphore that limits the number of concurrent requests
+    :param int ticket_id:
+    :param list[str] include: side-loads for the ticket
+    :return dict: ticket dictionary
+    """
+    response = await get_json(client, sem, f'/api/v2/tickets/{ticket_id}.json', {'include': ','.join(include)})
+    ticket = response.pop('ticket')
+    return {**response, **ticket}
+
+
+async def fetch_last_updated_tickets(credentials: dict[str, str], since_datetime: datetime, include: list[str]=['metric_sets'], sem_limit=16) -> AsyncGenerator[dict, None]:
+    """Fetches last updated tickets since `since_datetime`, sorted by `updated_at` in ascending order.
+
+    Tickets from each search results page are fetched concurrently.
+
+    :param dict[str, str] credentials: Zendesk API credentials (`email`, `token` and `subdomain`)
+    :param datetime since_datetime: datetime to use as starting point for the search
+    :param list[str] include: side-loads for the tickets, defaults to ['metric_sets']
+    :param int sem_limit: max number of concurrent requests, defaults to 16
+    :yield AsyncGenerator[dict, None]: ticket dictionaries
+    """
+    sem = asyncio.Semaphore(sem_limit)
+    url = '/api/v2/search.json'
+    params = {
+        'query': f"type:ticket updated_at>{since_datetime.astimezone(tz.tzutc()):%Y-%m-%dT%H:%M:%SZ}",
+        'sort_by': 'updated_at',
+        'sort_order': 'asc'
+    }
+    async with zendesk_async_client(credentials, sem_limit) as client:
+        while url:
+            page = await get_json(client, sem, url, params)
+            for ticket in await asyncio.gather(*(fetch_ticket(client, sem, result['id'], include) for result in page['results'])):
+                yield ticket
+            url, params = page.get('next_page'), None
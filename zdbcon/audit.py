@@ -1,9 +1,13 @@
-from typing import Generator
+from __future__ import annotations
+import asyncio
+from typing import Generator, TYPE_CHECKING
 from zdbcon.zp import Zendesk
-import pandas as pd
-from zenpy.lib.response import GenericCursorResultsGenerator
-from zenpy.lib.api_objects import Audit
-from zenpy.lib.proxy import ProxyDict
+from zdbcon import _flatten
+
+if TYPE_CHECKING:
+    from zenpy.lib.response import GenericCursorResultsGenerator
+    from zenpy.lib.api_objects import Audit
+    from zenpy.lib.proxy import ProxyDict
 
 class ZenAudit(Zendesk):
     """Pipeline for audit metadata.
@@ -14,8 +18,12 @@ class ZenAudit(Zendesk):
 
     :param Zendesk: Zendesk parent class
     """
+    PROCESSED_AUDITS_CACHE_SIZE = 4096
+
     def __init__(self, credentials: dict[str, str], type_mapping: dict[str, dict[str, str]]):
         super().__init__(table='Audits', credentials=credentials, type_mapping=type_mapping)
+        self._audits_cache: tuple[int, str, list[dict]] | None = None
+        self._processed_audits: dict[int, dict] = {}
 
     def get_ticket_audits(self, id: int) -> GenericCursorResultsGenerator[Audit]:
         """Generator for ticket audits
@@ -25,6 +33,33 @@ class ZenAudit(Zendesk):
         """
         return self.client.tickets.audits(ticket=id)
 
+    def fetch_audits(self, ticket_id: int, updated_at: str | None = None) -> list[dict]:
+        """Fetches all audits for `ticket_id` once, as a list of dictionaries that can be shared between consumers.
+
+        The last fetched list is kept and reused while the ticket's `updated_at` does not change.
+
+        :param int ticket_id:
+        :param str | None updated_at: ticket's `updated_at`, if None audits are always re-fetched, defaults to None
+        :return list[dict]: list of audit dictionaries
+        """
+        if updated_at is not None and self._audits_cache is not None and self._audits_cache[:2] == (ticket_id, updated_at):
+            return self._audits_cache[2]
+        audits = [a.to_dict() for a in self.client.tickets.audits(ticket=ticket_id)]
+        self._audits_cache = (ticket_id, updated_at, audits)
+        self._processed_audits.clear()
+        return audits
+
+    def fetch_audits_batch(self, ticket_ids: list[int], sem_limit=8) -> dict[int, list[dict]]:
+        """Fetches the audits for all `ticket_ids` concurrently (see `zdbcon.async_client.fetch_audits_batch`).
+
+        :param list[int] ticket_ids: IDs of the tickets
+        :param int sem_limit: max number of concurrent requests, defaults to 8
+        :return dict[int, list[dict]]: dictionary of ticket ID to list of audit dictionaries
+        """
+        from zdbcon.async_client import fetch_audits_batch
+
+        return asyncio.run(fetch_audits_batch(self.credentials, ticket_ids, sem_limit=sem_limit))
+
     @staticmethod
     def process_audit(audit: Audit) -> dict:
         """Turns Audit into flattened dict.
@@ -40,24 +75,21 @@ class ZenAudit(Zendesk):
             d['metadata']['decoration'].pop('links', None)
         return Zendesk.flatten_dict(d, ['id', 'type'])
 
-    def map_type(self, column: str, pd_type: str) -> str:
-        """Maps a given column with the pandas datatype to a SQL datatype using mapping dict from a JSON file
+    def processed_audit(self, audit: Audit) -> dict:
+        """Memoized `ZenAudit.process_audit`, keyed by audit ID.
 
-        :param str column: column name
-        :param str pd_type: pandas datatype
-        :return str: SQL compatible data type
+        The cache is cleared when `self.fetch_audits` fetches a new ticket, and holds at most `PROCESSED_AUDITS_CACHE_SIZE` audits
+        (the oldest is evicted first), so audits from `self.fetch_audits_batch` or other iterators don't grow it without bound.
+
+        :param Audit audit: Zenpy Audit object
+        :return dict: flattened dictionary
         """
-        direct_map: dict = self.mapping_dict['direct']
-        date_map: dict = self.mapping_dict['date_fields']
-        except_map: dict = self.mapping_dict['except']
-
-        if column in date_map or column[-3:] == '_at':
-            return 'datetime'
-        if pd_type in direct_map:
-            return direct_map[pd_type]
-        if column in except_map:
-            return except_map[column]
-        return pd_type
+        cache = self._processed_audits
+        if audit.id not in cache:
+            if len(cache) >= self.PROCESSED_AUDITS_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[audit.id] = ZenAudit.process_audit(audit)
+        return cache[audit.id]
 
     def get_field_name(self, field_id: str) -> str:
         return self.client.ticket_fields(id=field_id).title
@@ -65,16 +97,16 @@ class ZenAudit(Zendesk):
     def field_events(self, ticket_id: int, field_name: str | int, audits: list[dict] | Generator[Audit, None, None]):
         def audits_gen():
             for a in audits:
-                if type(a) != dict:
+                if not isinstance(a, dict):
                     yield a.to_dict()
                 else:
                     yield a
-        keys = {'field_name'}
+        field_name = str(field_name)
         return (
             {
                 'ticket_id': ticket_id,
                 'changed_at': audit['created_at'],
-                **{x: event[x] for x in event if x not in keys},
+                **{k: v for k, v in event.items() if k not in _flatten.FIELD_EVENT_EXCLUDED_KEYS},
                 'id': f"{audit['id']}-{event['id']}",
                 'audit_id': audit['id'],
                 'event_id': event['id']
@@ -82,26 +114,26 @@ class ZenAudit(Zendesk):
             for audit in audits_gen()
                 for event in audit['events']
                     if (event['type'] == 'Change' or event['type'] == 'Create')
-                    and event['field_name'] == str(field_name)
+                    and event['field_name'] == field_name
         )
 
-    def status_change_events(self, ticket_id: int, audits: list[dict] | Generator[Audit, None, None]) -> dict[str, any]:
+    def status_change_events(self, ticket_id: int, audits: list[dict] | Generator[Audit, None, None] | None = None) -> dict[str, any]:
         """Status changes events dicts for the given ticket id
 
         :param int ticket_id:
-        :param list[dict] audits:
+        :param list[dict] audits: ticket audits, defaults to None and uses `self.fetch_audits`
         :return dict: status change events dictionary
         """
-        return self.field_events(ticket_id, 'status', audits=audits)
+        return self.field_events(ticket_id, 'status', audits=self.fetch_audits(ticket_id) if audits is None else audits)
 
-    def commercial_status_change_events(self, ticket_id: int, audits: list[dict] | Generator[Audit, None, None]) -> dict[str, any]:
+    def commercial_status_change_events(self, ticket_id: int, audits: list[dict] | Generator[Audit, None, None] | None = None) -> dict[str, any]:
         """Commercial status changes events dicts for the given ticket id
 
         :param int ticket_id:
-        :param list[dict] audits:
+        :param list[dict] audits: ticket audits, defaults to None and uses `self.fetch_audits`
         :return dict: commercial status change events dictionary
         """
-        return self.field_events(ticket_id, 26870412763796, audits=audits)
+        return self.field_events(ticket_id, 26870412763796, audits=self.fetch_audits(ticket_id) if audits is None else audits)
 
     def audit_type_list(self, audit: Audit) -> list[dict[str, str]]:
         """Type list for given audit
@@ -109,6 +141,5 @@ class ZenAudit(Zendesk):
         :param Audit audit: Zenpy Audit object
         :return list[dict[str, str]]: type list
         """
-        df = pd.json_normalize(ZenAudit.process_audit(audit))
-        pd_types = df.dtypes.to_dict()
-        return [{'column': key, 'value': val, 'type': self.map_type(key, str(pd_types[key]))} for key, val in df.iloc[0].to_dict().items() if val is not None]
+        flat = Zendesk._normalise_json(self.processed_audit(audit))
+        return [{'column': key, 'value': val, 'type': self.map_type(key, Zendesk._py_to_pd_dtype(val))} for key, val in flat.items() if val is not None]
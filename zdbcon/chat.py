@@ -18,12 +18,13 @@ class ZenChat(ZenAudit):
         :param int ticket_id:
         :return list: chat history list
         """
+        event_id = event['id']
         return [
             {
                 "ticket_id": ticket_id,
-                "id": f"{event['id']}-{idx}",
+                "id": f"{event_id}-{idx}",
                 "content": history,
-                "chat_id": event['id']
+                "chat_id": event_id
             }
             for idx, history in enumerate(event['value']['history'])
                 if history['type'] == "ChatMessage"
@@ -35,12 +36,7 @@ class ZenChat(ZenAudit):
         :param int ticket_id:
         :yield GeneratorExit[list[dict]]: yields a formatted chat history using `ZenChat.format_chat_history`
         """
-        return (
-            history for audit in self.client.tickets.audits(ticket=ticket_id)
-            for event in audit.events
-                if event['type'] == 'ChatStartedEvent'
-            for history in self.format_chat_history(event, ticket_id)
-        )
+        return self.get_chat_history_from(ticket_id, self.fetch_audits(ticket_id))
 
     def append_ticket_chat(self, ticket_id: int):
         """Appends chat for `ticket_id` to ChatLogs table
@@ -48,8 +44,7 @@ class ZenChat(ZenAudit):
         :param int ticket_id:
         """
         self.vp("Appending Ticket Chat")
-        for history in self.get_chat_history(ticket_id):
-            self.append_obj(history, recache=False, force=False)
+        self.append_many(list(self.get_chat_history(ticket_id)), recache=False, force=False)
 
     def get_chat_history_from(self, ticket_id: int, audits: list[dict]):
         return (
@@ -60,5 +55,4 @@ class ZenChat(ZenAudit):
         )
 
     def append_ticket_chat_from(self, ticket_id: int, audits: list[dict]):
-        for history in self.get_chat_history_from(ticket_id, audits):
-            self.append_obj(history, recache=False, force=False)
+        self.append_many(list(self.get_chat_history_from(ticket_id, audits)), recache=False, force=False)
@@ -0,0 +1,37 @@
+import pickle
+import sqlite3
+from pathlib import Path
+
+
+class DiskCache:
+    def __init__(self, cache_dir: str | Path, name='zdbcon_cache.sqlite3'):
+        """Key-value cache persisted to a `sqlite3` database, values are stored pickled.
+
+        :param str | Path cache_dir: directory for the cache database, created if it does not exist
+        :param str name: name of the database file, defaults to 'zdbcon_cache.sqlite3'
+        """
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(Path(cache_dir) / name)
+        self._db.execute('create table if not exists cache (key text primary key, value blob)')
+
+    def get(self, key: str, default: any=None) -> any:
+        """Cached value for `key`
+
+        :param str key:
+        :param any default: returned if `key` is not cached, defaults to None
+        :return any: unpickled value
+        """
+        row = self._db.execute('select value from cache where key=?', (key,)).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value: any):
+        """Caches `value` under `key`, replacing any previous value
+
+        :param str key:
+        :param any value: picklable value
+        """
+        with self._db:
+            self._db.execute('insert or replace into cache (key, value) values (?, ?)', (key, pickle.dumps(value)))
+
+    def close(self):
+        self._db.close()
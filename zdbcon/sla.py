@@ -1,5 +1,11 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from zdbcon.audit import ZenAudit
-from zenpy.lib.api_objects import Audit
+
+if TYPE_CHECKING:
+    from zenpy.lib.api_objects import Audit
+
+_EMPTY = {}
 
 class ZenSLA(ZenAudit):
     def __init__(self, credentials: dict[str, str], type_mapping: dict[str, dict[str, str]]):
@@ -20,14 +26,14 @@ class ZenSLA(ZenAudit):
         :param int ticket_id:
         :return dict:
         """
-        if type(audit) == dict:
+        if isinstance(audit, dict):
             audit_id = audit['id']
             audit_creation = audit['created_at']
         else:
             audit_id = audit.id
             audit_creation = audit.created_at
         return {
-            **dict(x for x in event.items() if x[0]!='previous_value'),
+            **{k: v for k, v in event.items() if k != 'previous_value'},
             'id': f"{audit_id}-{event['id']}",
             'event_id': event['id'],
             'audit_id': audit_id,
@@ -42,7 +48,7 @@ class ZenSLA(ZenAudit):
         :param dict event:
         :return bool: True if event is an SLA change
         """
-        return event['type'] =='Change' and  'via' in event and event['via']['source']['rel'] == 'sla_target_change'
+        return event.get('type') == 'Change' and (via := event.get('via')) is not None and via.get('source', _EMPTY).get('rel') == 'sla_target_change'
 
     def get_sla_changes(self, ticket_id: int) -> GeneratorExit:
         """Yields dictionaries for each event in the Audits for `ticket_id`
@@ -50,7 +56,7 @@ class ZenSLA(ZenAudit):
         :param int ticket_id:
         :yield GeneratorExit[dict]: event dictionary
         """
-        return (self.format_event(e, a, ticket_id) for a in self.client.tickets.audits(ticket=ticket_id) for e in a.events if ZenSLA.is_sla_change(e))
+        return self.extract_sla_changes_from(ticket_id, self.fetch_audits(ticket_id))
 
     def append_ticket_sla_changes(self, ticket_id: int, force=False):
         """Appends all SLA changes for `ticket_id` to SLAAudit Table
@@ -59,12 +65,13 @@ class ZenSLA(ZenAudit):
         :param bool force: If True, SLA changes will be force updated even if they are already found in the table, defaults to False
         """
         self.vp(">\tAppending SLA Changes")
-        for h in self.get_sla_changes(ticket_id):
-            self.append_obj(h, recache=False, force=force)
+        self.append_many(list(self.get_sla_changes(ticket_id)), recache=False, force=force)
 
     def extract_sla_changes_from(self, ticket_id: int, audits: list[dict]):
-        return (self.format_event(event, audit, ticket_id) for audit in audits for event in audit['events'] if ZenSLA.is_sla_change(event))
+        return (
+            self.format_event(event, audit, ticket_id) for audit in audits for event in audit['events']
+                if event.get('type') == 'Change' and (via := event.get('via')) is not None and via.get('source', _EMPTY).get('rel') == 'sla_target_change'
+        )
 
     def append_sla_changes_from(self, ticket_id: int, audits: list[dict], force=False):
-        for history in self.extract_sla_changes_from(ticket_id=ticket_id, audits=audits):
-            self.append_obj(history, recache=False, force=force)
+        self.append_many(list(self.extract_sla_changes_from(ticket_id=ticket_id, audits=audits)), recache=False, force=force)
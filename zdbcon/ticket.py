@@ -1,6 +1,12 @@
-import pandas as pd
+from __future__ import annotations
+from typing import TYPE_CHECKING
 from zdbcon.zp import Zendesk
-from zenpy.lib.api_objects import Ticket, TicketField
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from zenpy.lib.api_objects import Ticket, TicketField
+    from zdbcon.chat import ZenChat
+    from zdbcon.sla import ZenSLA
 
 class ZenTicket(Zendesk):
     def __init__(self, credentials: dict[str, str], mapping_dict: dict[str, dict[str, str]]):
@@ -9,26 +15,49 @@ class ZenTicket(Zendesk):
         :param dict[str, str] credentials: Zendesk API credentials
         """
         super().__init__('Tickets', credentials=credentials, type_mapping=mapping_dict)
-        self.ticket_fields = { str(f.id): f for f in self.client.ticket_fields() }
+        self.recache_ticket_fields()
 
     def recache_ticket_fields(self):
-        self.ticket_fields = { str(f.id): f for f in self.client.ticket_fields() }
+        """Recaches ticket fields from Zendesk and clears the tagger varchar width cache.
+        """
+        self.ticket_fields: dict[str, TicketField] = { str(f.id): f for f in self.client.ticket_fields() }
+        self._tagger_width_cache: dict[str, int] = {}
+
+    def tagger_width(self, field_id: str) -> int:
+        """Length of the longest option name for the tagger field with `field_id`. Memoized per field.
+
+        :param str field_id: ID of the ticket field
+        :return int: max option name length
+        """
+        if field_id not in self._tagger_width_cache:
+            self._tagger_width_cache[field_id] = max(len(cfo.name) for cfo in self.ticket_fields[field_id].custom_field_options)
+        return self._tagger_width_cache[field_id]
 
     def ticket_dict(self, ticket: Ticket | dict) -> dict:
-        d: dict = ticket if type(ticket) == dict else ticket.to_dict()
+        d: dict = ticket if isinstance(ticket, dict) else ticket.to_dict()
         d.pop('metric_events', None)
         return d
 
-    def ticket_to_table(self, ticket: Ticket | dict) -> pd.DataFrame:
-        """Converts ticket instance to pandas dataframe.
+    def flat_ticket(self, ticket: Ticket | dict) -> dict:
+        """Converts ticket instance to a single level dictionary with the same keys as the `ticket_to_table` columns.
 
         :param Ticket|dict ticket: ticket instance or dictionary
-        :return pd.DataFrame: pandas dataframe
+        :return dict: flat ticket dictionary
         """
         td: dict = self.ticket_dict(ticket)
         for f in ['custom_fields', 'fields']:
             td.update({f: Zendesk._normalized_fields(td[f])})
-        return pd.json_normalize(td)
+        return Zendesk._normalise_json(td)
+
+    def ticket_to_table(self, ticket: Ticket | dict) -> pd.DataFrame:
+        """Converts ticket instance to pandas dataframe.
+
+        :param Ticket|dict ticket: ticket instance or dictionary
+        :return pd.DataFrame: pandas dataframe
+        """
+        import pandas as pd
+
+        return pd.DataFrame([self.flat_ticket(ticket)])
     
     def get_sample_ticket(self) -> Ticket:
         """Retrieves sample ticket from Zendesk.
@@ -38,23 +67,31 @@ class ZenTicket(Zendesk):
         return self.client.tickets()[:1][0]
     
     def get_field(self, id: int) -> TicketField:
-        """Retrieves ticket field with given ID
+        """Retrieves ticket field with given ID from the Zendesk API.
+
+        Makes a request on every call, prefer the cached `self.ticket_fields` (keyed by `str(id)`).
 
         :param int id: ID of the ticket field
         :return TicketField: 
         """
         return self.client.ticket_fields(id=id)
     
-    def raw_ticket_field_types(self, ticket_table: pd.DataFrame|None=None) -> dict[str, str]:
+    def raw_ticket_field_types(self, ticket_table: pd.DataFrame|dict|None=None) -> dict[str, str]:
         """Creates dictionary with raw ticket types (as defined by `pandas`). Converts custom field types using Zendesk's api.
 
-        :param pd.DataFrame | None ticket_table: optional reference ticket's table, defaults to None and uses `self.get_sample_ticket` along with `self.ticket_to_table`
+        :param pd.DataFrame | dict | None ticket_table: optional reference ticket's table or flat dictionary (see `self.flat_ticket`), defaults to None and uses `self.get_sample_ticket` along with `self.ticket_to_table`
         :return dict[str, str]: 
         """
         ticket_table = ticket_table if ticket_table is not None else self.ticket_to_table(self.get_sample_ticket())
-        return { name: (str(t) if 'custom_fields.' not in name else self.ticket_fields[name.split('.')[1]].type) for name, t in ticket_table.dtypes.to_dict().items()}
+        if isinstance(ticket_table, dict):
+            raw_types = { name: Zendesk._py_to_pd_dtype(v) for name, v in ticket_table.items() }
+        else:
+            raw_types = { name: str(t) for name, t in ticket_table.dtypes.to_dict().items() }
+        ticket_fields = self.ticket_fields
+        custom_prefix_len = len('custom_fields.')
+        return { name: (ticket_fields[name[custom_prefix_len:]].type if name.startswith('custom_fields.') else t) for name, t in raw_types.items()}
 
-    def ticket_field_types(self, ticket_table: pd.DataFrame|None = None, varchar_buffer=5) -> dict[str, str]:
+    def ticket_field_types(self, ticket_table: pd.DataFrame|dict|None = None, varchar_buffer=5) -> dict[str, str]:
         """Uses data mapping `JSON` to map ticket types to SQL types.
 
         Expects 3 keys: `"direct"`, `"except"`, `"date_fields"`.
@@ -75,34 +112,35 @@ class ZenTicket(Zendesk):
         }
         ```
 
-        :param pd.DataFrame | None ticket_table: dataframe created from ticket, defaults to None
+        :param pd.DataFrame | dict | None ticket_table: dataframe or flat dictionary created from ticket, defaults to None
         :param int varchar_buffer: buffer multiplier for max size string to be used as `varchar(max * varchar_buffer)`, defaults to 3
         :return dict[str, str]: dictionary with mapped types.
         """
         raw_types = self.raw_ticket_field_types(ticket_table)
-        direct_map: dict = self.mapping_dict['direct']
-        date_map: dict = self.mapping_dict['date_fields']
-        except_map: dict = self.mapping_dict['except']
+        direct_map: dict = self._direct_map
+        date_map: set[str] = self._date_map
+        except_map: dict = self._except_map
+
+        ticket_fields = self.ticket_fields
+        custom_prefix_len = len('custom_fields.')
 
         for field_name, t in raw_types.items():
-            update_dict = {}
-            if t in direct_map:
-                update_dict = {field_name: direct_map[t]}
+            if field_name.startswith('custom_fields.'):
+                sid = field_name[custom_prefix_len:]
+                if sid in except_map:
+                    raw_types[field_name] = except_map[sid]
+                    continue
+                if ticket_fields[sid].type == 'tagger':
+                    raw_types[field_name] = f'varchar({self.tagger_width(sid) * varchar_buffer})'
+                    continue
             if field_name in date_map:
-                update_dict = {field_name: 'datetime'}
-            if 'custom_fields.' in field_name:
-                id = int(field_name.split('.')[1])
-                if self.get_field(id).type == 'tagger':
-                    max_char = max([len(cfo.name) for cfo in self.client.ticket_fields(id=id).custom_field_options])
-                    update_dict = {field_name: f'varchar({max_char * varchar_buffer})'}
-                if (sid:=str(id)) in except_map:
-                    update_dict = {field_name: except_map[sid]}
-            
-            raw_types.update(update_dict)
-        
+                raw_types[field_name] = 'datetime'
+            elif t in direct_map:
+                raw_types[field_name] = direct_map[t]
+
         return raw_types
 
-    def append_ticket(self, ticket: Ticket|dict, force_update=False) -> bool:
+    def append_ticket(self, ticket: Ticket|dict, force_update=False, known_ids: set[int]|None=None) -> bool:
         """Appends given ticket to Ticket table. Returns `True` if append was successful.
         
         Tickets that are closed and have already been inserted are ignored.
@@ -113,48 +151,64 @@ class ZenTicket(Zendesk):
 
         :param Ticket|dict ticket: Ticket instance or ticket dictionary from `Ticket().to_dict()`
         :param bool force_update: forces ticket update even if ticket is closed and already in table
+        :param set[int] | None known_ids: IDs already in the table, shared across a batch of appends, defaults to None and uses the cached `self.get_table_ids`
         :return bool: 
         """
-        if type(ticket) == dict:
+        if isinstance(ticket, dict):
             ticket_status = ticket['status']
             ticket_id = ticket['id']
         else:
             ticket_status = ticket.status
             ticket_id = ticket.id
-        table_ids = self.get_table_ids(recache=False)
+        table_ids = self.get_table_ids(recache=False) if known_ids is None else known_ids
         if ticket_status == 'closed' and (ticket_id in table_ids):
             self.vp("Ticket is closed and already in table.")
             if not force_update:
                 return False
             self.vp("Forcing update anyway.")
 
-        df: pd.DataFrame = self.ticket_to_table(ticket)
+        flat: dict = self.flat_ticket(ticket)
 
-        ftypes = self.ticket_field_types(ticket_table=df)
+        ftypes = self.ticket_field_types(ticket_table=flat)
 
-        ticket_list: list[dict[str, str]] = list(filter(lambda x: x['value'] is not None, ({'column': key, 'value': val, 'type': ftypes[key]} for key, val in df.iloc[0].to_dict().items())))
+        bound_values: dict[str, any] = {}
+        for key, val in flat.items():
+            if val is None: continue
+            col, bound = Zendesk.bind_value({'column': key, 'value': val, 'type': ftypes[key]})
+            bound_values[col] = bound
 
-        column_list: list[str] = [t['column'] for t in ticket_list]
-        columns = f"[{'], ['.join(column_list)}]"
+        columns, values = self.sql_columns_and_values(bound_values)
 
-        parsed_values: dict[str, str] = dict(map(Zendesk.parse_value, ticket_list))
-        values = ', '.join(parsed_values.values())
-
-        for col_name, col_type in ftypes.items():
-            if not self.has_column(col_name):
-                self.vp(f'Column {col_name} ({col_type}) does not exist, adding it now.')
-                self.add_column(col_name, col_type)
-                self.cache_table_columns()
+        self.add_columns([{'column': col_name, 'type': col_type} for col_name, col_type in ftypes.items()])
 
         if ticket_id in table_ids:
             self.vp(f'Updating {ticket_status} ticket.')
-            self.execute(f"update {self.table} set {', '.join([f'[{c}]={v}' for c, v in parsed_values.items()])} where id={ticket_id}")
+            self.execute(self.sql_update_str(bound_values), params=(*bound_values.values(), ticket_id))
         else:
             self.vp('Inserting ticket.')
-            self.execute(self.sql_insertion_str(columns=columns, values=values))
+            self.execute(self.sql_insertion_str(columns=columns, values=values), params=tuple(bound_values.values()))
         
         self.commit()
 
-        self.id_cache.add(ticket_id)
+        table_ids.add(ticket_id)
+        if self.id_cache is not None:
+            self.id_cache.add(ticket_id)
 
         return True
+
+    def append_ticket_audit_data(self, ticket: Ticket|dict, chat: ZenChat, sla: ZenSLA, force=False) -> list[dict]:
+        """Fetches the audits for `ticket` a single time and appends its chat history and SLA changes.
+
+        Returns the fetched audits so they can be reused, e.g. by `ZenAudit.status_change_events`.
+
+        :param Ticket|dict ticket: Ticket instance or ticket dictionary from `Ticket().to_dict()`
+        :param ZenChat chat: chat pipeline
+        :param ZenSLA sla: SLA pipeline
+        :param bool force: force update of SLA changes already in table, defaults to False
+        :return list[dict]: list of audit dictionaries for `ticket`
+        """
+        td = self.ticket_dict(ticket)
+        audits = chat.fetch_audits(td['id'], td['updated_at'])
+        chat.append_ticket_chat_from(td['id'], audits)
+        sla.append_sla_changes_from(td['id'], audits, force=force)
+        return audits
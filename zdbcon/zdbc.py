@@ -1,9 +1,20 @@
-import pandas as pd
+import sys
+import asyncio
+import time
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from typing import Generator
+from typing import Generator, AsyncGenerator
+from copy import deepcopy
+from dataclasses import asdict
+from collections import namedtuple, defaultdict
+from itertools import islice, chain
 from dateutil import tz
 from dateutil import parser as date_parser
-from pytz import timezone
+from pytz import timezone, utc
+from functools import lru_cache
 
 from zenpy.lib.response import GenericCursorResultsGenerator
 from zenpy import Zenpy
@@ -11,21 +22,94 @@ from zenpy.lib.api_objects import Ticket, Audit
 from zenpy.lib.proxy import ProxyDict
 
 from zdbcon.credentials import Credentials
+from zdbcon import async_client
+from zdbcon.disk_cache import DiskCache
+from zdbcon import _flatten
+
+ZENDESK_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+_CHANGE = sys.intern('Change')
+_SLA_TARGET_CHANGE = sys.intern('sla_target_change')
+_CHANGE_OR_CREATE = frozenset((_CHANGE, sys.intern('Create')))
+
+_AuditView = namedtuple('_AuditView', 'id created_at events id_prefix')
+_EventPartition = namedtuple('_EventPartition', 'by_type by_field')
+
+_CLIENTS: dict[tuple[str, str, str], Zenpy] = {}
+_HTTP_CLIENTS: dict[tuple[str, str, str], httpx.Client] = {}
 
 
 class ZDBC:
-    def __init__(self, credentials: Credentials):
+    AUDIT_CACHE_SIZE = 8192
+    _audit_dict_cache: dict[int, dict] = {}
+
+    def __init__(self, credentials: Credentials, cache_dir: str|None=None):
+        """Zendesk API connector
+
+        :param Credentials credentials: Zendesk API credentials
+        :param str | None cache_dir: directory for the persistent audit parsing cache, defaults to None (no disk cache)
+        """
         self._credentials = credentials
+        self._disk_cache: DiskCache | None = None if cache_dir is None else DiskCache(cache_dir)
         self.connect_zendesk()
 
     def connect_zendesk(self):
         """Creates an API client with ZenPy using the credentials given at `__init__`.
+
+        Clients are shared between instances with the same credentials, and keep a pool of HTTP connections alive.
+        """
+        key = (self._credentials.subdomain, self._credentials.email, self._credentials.token)
+        if key not in _CLIENTS:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, **Zenpy.http_adapter_kwargs()))
+            _CLIENTS[key] = Zenpy(
+                subdomain=self._credentials.subdomain,
+                email=self._credentials.email,
+                token=self._credentials.token,
+                session=session
+            )
+        self.zendesk_client: Zenpy = _CLIENTS[key]
+        self._client_key = key
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """`httpx.Client` used for raw API requests. Created on first use and shared between instances with the same credentials.
+
+        :return httpx.Client: client with the Zendesk `base_url` and authentication set
         """
-        self.zendesk_client: Zenpy = Zenpy(
-            subdomain=self._credentials.subdomain,
-            email=self._credentials.email,
-            token=self._credentials.token
-        )
+        if self._client_key not in _HTTP_CLIENTS:
+            _HTTP_CLIENTS[self._client_key] = httpx.Client(**async_client.zendesk_client_kwargs(asdict(self._credentials)))
+        return _HTTP_CLIENTS[self._client_key]
+
+    def close(self):
+        """Closes the shared `httpx.Client` for this instance's credentials (recreated on next use) and the disk cache.
+        """
+        http_client = _HTTP_CLIENTS.pop(self._client_key, None)
+        if http_client is not None:
+            http_client.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+    def _raw_get(self, path: str, params: dict|None=None, max_retries=5) -> dict:
+        """GET request to the Zendesk API that skips ZenPy object construction. The response is parsed with `orjson`.
+
+        Requests that get a `429` response are retried after the `Retry-After` header (or with exponential backoff).
+
+        :param str path: endpoint path
+        :param dict | None params: query parameters, defaults to None
+        :param int max_retries: number of times to retry a rate limited request, defaults to 5
+        :return dict: response JSON
+        """
+        attempt = 0
+        while True:
+            response = self.http_client.get(path, params=params)
+            delay = async_client.retry_delay(response, attempt, max_retries)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     def fetch_ticket_audits(self, ticket_id: int) -> GenericCursorResultsGenerator[Audit]:
         """Generator for ticket audits
@@ -35,14 +119,58 @@ class ZDBC:
         """
         return self.zendesk_client.tickets.audits(ticket=ticket_id)
 
-    def fetch_last_updated_tickets(self, since_datetime: datetime, include: list[str]=['metric_sets']) -> Generator[Ticket, None, None]:
+    def fetch_ticket_audits_raw(self, ticket_id: int) -> list[dict]:
+        """Fetches all audits for `ticket_id` as plain dictionaries, without ZenPy objects.
+
+        The audit dictionaries can be passed to the `extract_*` methods in place of `Audit` instances.
+
+        :param int ticket_id: ticket id
+        :return list[dict]: list of audit dictionaries
+        """
+        audits: list[dict] = []
+        params = async_client.audits_page_params()
+        while params is not None:
+            page = self._raw_get(f'/api/v2/tickets/{ticket_id}/audits.json', params)
+            audits.extend(page['audits'])
+            params = async_client.audits_page_params(page)
+        return audits
+
+    def fetch_audits_for_tickets(self, ticket_ids: list[int], sem_limit=8) -> dict[int, list[dict]]:
+        """Fetches the audits for all `ticket_ids` concurrently.
+
+        The audit dictionaries can be passed to the `extract_*` methods in place of `Audit` instances.
+
+        :param list[int] ticket_ids: IDs of the tickets
+        :param int sem_limit: max number of concurrent requests, defaults to 8
+        :return dict[int, list[dict]]: dictionary of ticket ID to list of audit dictionaries
+        """
+        return asyncio.run(async_client.fetch_audits_batch(asdict(self._credentials), list(ticket_ids), sem_limit=sem_limit))
+
+    def fetch_last_updated_tickets(self, since_datetime: datetime, include: list[str]=['metric_sets'], batch_size=100) -> Generator[Ticket, None, None]:
         """Fetches last updated tickets since `since_datetime`, sorted by `updated_at` in ascending order.
 
+        Tickets are re-fetched with the `include` side-loads in batches of `batch_size` through Zendesk's `show_many` endpoint.
+
         :param datetime since_datetime: datetime to use as starting point for API GET
+        :param list[str] include: side-loads for the tickets, defaults to ['metric_sets']
+        :param int batch_size: number of tickets per `show_many` request (Zendesk allows up to 100), defaults to 100
         :yield Generator[Ticket, None, None]: ticket search generator
         """
-        for ticket in self.zendesk_client.search(type='ticket', updated_at_after=since_datetime.astimezone(tz.tzutc()), sort_by='updated_at', sort_order='asc'):
-            yield self.zendesk_client.tickets(id=ticket.id, include=include)
+        search = self.zendesk_client.search(type='ticket', updated_at_after=since_datetime.astimezone(tz.tzutc()), sort_by='updated_at', sort_order='asc')
+        while batch := [ticket.id for ticket in islice(search, batch_size)]:
+            tickets = { ticket.id: ticket for ticket in self.zendesk_client.tickets(ids=batch, include=include) }
+            yield from (tickets[id] for id in batch if id in tickets)
+
+    async def fetch_last_updated_tickets_async(self, since_datetime: datetime, include: list[str]=['metric_sets'], sem_limit=16) -> AsyncGenerator[dict, None]:
+        """Asynchronous `fetch_last_updated_tickets`: tickets from each search results page are fetched concurrently.
+
+        :param datetime since_datetime: datetime to use as starting point for API GET
+        :param list[str] include: side-loads for the tickets, defaults to ['metric_sets']
+        :param int sem_limit: max number of concurrent requests, defaults to 16
+        :yield AsyncGenerator[dict, None]: ticket dictionaries
+        """
+        async for ticket in async_client.fetch_last_updated_tickets(asdict(self._credentials), since_datetime, include, sem_limit):
+            yield ticket
 
     def fetch_deleted_tickets(self) -> Generator[Ticket, None, None]:
         """Fetches the last deleted tickets from the API. They are returned in `deleted_at` ascending erder.
@@ -62,120 +190,239 @@ class ZDBC:
         :param Ticket ticket: ticket instance
         :return dict: dictionary with ticket data
         """
-        td: dict = ticket if type(ticket) == dict else ticket.to_dict()
-        td.pop('metric_events', None)
+        flat = ZDBC.flat_ticket(ticket)
 
-        for f in ['custom_fields', 'fields']:
-            td.update(
-                {
-                    f: {} if not td[f] else {
-                        f['id']:f['value'] for f in td[f]
-                    }
-                }
-            )
-        ticket_dataframe = pd.json_normalize(td)
+        for date_field in date_fields:
+            if flat.get(date_field):
+                flat[date_field] = ZDBC.utc_to_tz(flat[date_field])
+
+        return flat
+
+    @staticmethod
+    def dicts_from_tickets(tickets: list[Ticket], date_fields: list[str], new_tz='America/Sao_Paulo') -> list[dict]:
+        """Batch version of `ZDBC.dict_from_ticket`: date fields are converted for all tickets at once with `pandas`.
+
+        Dates `pandas` can't parse as ISO 8601 are converted one by one with `ZDBC.utc_to_tz`, so results match `ZDBC.dict_from_ticket`.
+
+        :param list[Ticket] tickets: ticket instances or dictionaries
+        :param list[str] date_fields: fields to be converted from `UTC` to `new_tz`
+        :param str new_tz: new timezone for conversion, defaults to 'America/Sao_Paulo'
+        :return list[dict]: list of dictionaries with ticket data
+        """
+        import pandas as pd
+
+        flats = [ZDBC.flat_ticket(ticket) for ticket in tickets]
 
         for date_field in date_fields:
-            ticket_dataframe[date_field] = ticket_dataframe[date_field].map(ZDBC.utc_to_tz)
+            dates = pd.to_datetime(pd.Series([flat.get(date_field) for flat in flats], dtype=object), utc=True, format='ISO8601', errors='coerce')
+            converted = dates.dt.tz_convert(new_tz).dt.strftime('%Y-%m-%d %H:%M:%S')
+            for flat, date in zip(flats, converted):
+                if flat.get(date_field):
+                    flat[date_field] = date if isinstance(date, str) else ZDBC.utc_to_tz(flat[date_field], new_tz)
 
-        return ticket_dataframe.to_dict('records')[0]
+        return flats
 
     @staticmethod
+    def flat_ticket(ticket: Ticket) -> dict:
+        """Converts ticket into a single level dictionary, with `custom_fields` and `fields` keyed by field ID.
+
+        :param Ticket ticket: ticket instance or dictionary
+        :return dict: flat ticket dictionary
+        """
+        td: dict = ticket if isinstance(ticket, dict) else ticket.to_dict()
+        td.pop('metric_events', None)
+
+        for f in ['custom_fields', 'fields']:
+            td.update({f: _flatten.normalized_fields(td[f])})
+        return ZDBC.normalise_dict(td)
+
+    normalise_dict = staticmethod(_flatten.normalise_json)
+
+    @staticmethod
+    @lru_cache(maxsize=100_000)
     def utc_to_tz(utc_date: str, new_tz='America/Sao_Paulo') -> str:
         """Converts `utc_date` (Zendesk API formatted) into the given timezone as a string
         in the format: `'%Y-%m-%d %H:%M:%S'`
 
+        Dates in Zendesk's `'%Y-%m-%dT%H:%M:%SZ'` format are parsed with `strptime`, other formats fall back to `dateutil`.
+        Results are memoized, since the same dates repeat across a ticket's fields and audits.
+
         :param str utc_date: original Zendesk API
         :param str new_tz: new timezone for conversion, defaults to 'America/Sao_Paulo'
         :return str: string-formatted time (`'%Y-%m-%d %H:%M:%S'`)
         """
-        return date_parser.parse(utc_date).astimezone(timezone(new_tz)).strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            date = utc.localize(datetime.strptime(utc_date, ZENDESK_DATE_FORMAT))
+        except ValueError:
+            date = date_parser.parse(utc_date)
+        return date.astimezone(timezone(new_tz)).strftime('%Y-%m-%d %H:%M:%S')
 
     @staticmethod
     def dict_from_audit(audit: Audit) -> dict:
-        """Parses `Audit` instance into Python dictionary
+        """Parses `Audit` instance into Python dictionary. Results are memoized by audit ID (audits don't change once created).
+
+        Each call returns a deep copy of the memoized dictionary, so callers can modify it.
 
         :param Audit audit: ticket audit
         :return dict: dictionary
         """
+        cache = ZDBC._audit_dict_cache
+        if audit.id in cache:
+            return deepcopy(cache[audit.id])
         d:ProxyDict = audit.to_dict()
-        d.pop('events', None)
-        if 'decoration' in d['metadata']:
-            d['metadata']['decoration'].pop('links', None)
-        return ZDBC.flatten_dict(d, ['id', 'type'])
+        metadata = d.get('metadata') or {}
+        decoration = metadata.get('decoration')
+        if decoration is not None:
+            metadata = {**metadata, 'decoration': {k: v for k, v in decoration.items() if k != 'links'}}
+        d = {k: v for k, v in d.items() if k != 'events'}
+        d['metadata'] = metadata
+        if len(cache) >= ZDBC.AUDIT_CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[audit.id] = ZDBC.flatten_dict(d, ['id', 'type'])
+        return deepcopy(cache[audit.id])
+
+    def cached_dict_from_audit(self, audit: Audit) -> dict:
+        """`ZDBC.dict_from_audit` persisted to the disk cache (if `cache_dir` was given), keyed by audit ID.
+
+        :param Audit audit: ticket audit
+        :return dict: dictionary
+        """
+        if self._disk_cache is None:
+            return ZDBC.dict_from_audit(audit)
+        key = f'audit-{audit.id}'
+        d = self._disk_cache.get(key)
+        if d is None:
+            d = ZDBC.dict_from_audit(audit)
+            self._disk_cache.set(key, d)
+        return d
+
+    def cached_sla_history(self, ticket_id: int, audits: list[Audit]) -> list[dict]:
+        """`ZDBC.extract_sla_history` persisted to the disk cache (if `cache_dir` was given).
+
+        Keyed by the ticket's number of audits and last audit ID, since audits are only ever appended to a ticket.
+
+        :param int ticket_id: ID of the ticket that originates the audits
+        :param list[Audit] audits: list of audits from ticket with `ticket_id`
+        :return list[dict]: list of SLA event dictionaries
+        """
+        views = ZDBC.audit_views(audits)
+        if self._disk_cache is None or not views:
+            return ZDBC.extract_sla_history(ticket_id, views)
+        key = f'sla-{ticket_id}-{len(views)}-{max(a.id for a in views)}'
+        history = self._disk_cache.get(key)
+        if history is None:
+            history = ZDBC.extract_sla_history(ticket_id, views)
+            self._disk_cache.set(key, history)
+        return history
+
+    @staticmethod
+    def audit_views(audits: list[Audit]) -> list[_AuditView]:
+        """Reads `id`, `created_at` and `events` once from each `Audit`, so extractors don't go through ZenPy's proxy attributes per event.
+
+        Audit dictionaries (e.g. from `ZDBC.fetch_audits_for_tickets`) are also accepted.
+
+        :param list[Audit] audits: list of audits, audit dictionaries or audit views
+        :return list[_AuditView]: list of `(id, created_at, events, id_prefix)` named tuples, `id_prefix` being `'{id}-'`
+        """
+        return [
+            a if isinstance(a, _AuditView)
+            else _AuditView(a['id'], a['created_at'], a['events'], f"{a['id']}-") if isinstance(a, dict)
+            else _AuditView(a.id, a.created_at, a.events, f"{a.id}-")
+            for a in audits
+        ]
+
+    @staticmethod
+    def partition_events(audits: list[Audit] | _EventPartition) -> _EventPartition:
+        """Groups the events of all `audits` by event type in a single pass, keeping their order.
+
+        `Create` and `Change` events are also grouped by their `field_name`.
+
+        The result can be passed to the `extract_*` methods in place of `audits`, so each extractor only reads the events it needs.
+
+        :param list[Audit] | _EventPartition audits: list of audits (an already partitioned result is returned as is)
+        :return _EventPartition: `(by_type, by_field)` named tuple of dictionaries of event type and field name to lists of `(audit, event)` tuples
+        """
+        if isinstance(audits, _EventPartition):
+            return audits
+        by_type: defaultdict[str, list[tuple[_AuditView, dict]]] = defaultdict(list)
+        by_field: defaultdict[str, list[tuple[_AuditView, dict]]] = defaultdict(list)
+        for audit in ZDBC.audit_views(audits):
+            for event in audit.events:
+                event_type = event['type']
+                pair = (audit, event)
+                by_type[event_type].append(pair)
+                if event_type in _CHANGE_OR_CREATE:
+                    by_field[event.get('field_name')].append(pair)
+        return _EventPartition(by_type, by_field)
 
     @staticmethod
-    def extract_field_events_from_audits(ticket_id: int, audits: list[Audit], field_name: str):
+    def extract_field_events_from_audits(ticket_id: int, audits: list[Audit], field_name: str) -> list[dict]:
         """Extract all events with givin field name form list of ticket audits
 
         :param int ticket_id: ID of the ticket that originates the audits
-        :param list[Audit] audits: list of audits from ticket with `ticket_id`
+        :param list[Audit] audits: list of audits from ticket with `ticket_id`, or its `ZDBC.partition_events`
         :param str field_name: name of the field to be extracted
+        :return list[dict]: list of field change events
         """
-        keys = {'field_name'}
-        return (
+        return [
             {
                 'ticket_id': ticket_id,
                 'changed_at': audit.created_at,
-                **{x: event[x] for x in event if x not in keys},
-                'id': f"{audit.id}-{event['id']}",
+                **{k: v for k, v in event.items() if k not in _flatten.FIELD_EVENT_EXCLUDED_KEYS},
+                'id': audit.id_prefix + str(event['id']),
                 'audit_id': audit.id,
                 'event_id': event['id']
             }
-            for audit in audits
-                for event in audit.events
-                    if (event['type'] == 'Change' or event['type'] == 'Create')
-                    and event['field_name'] == str(field_name)
-        )
+            for audit, event in ZDBC.partition_events(audits).by_field.get(str(field_name), ())
+        ]
 
     @staticmethod
-    def extract_audit_chat_history(ticket_id: int, audits: list[Audit]) -> Generator[dict, None, None]:
+    def extract_audit_chat_history(ticket_id: int, audits: list[Audit]) -> list[dict]:
         """Extracts ticket chat history from given `Audit`
 
         :param int ticket_id: ID of the ticket that originates the audits
-        :param list[Audit] audit: `ZenPy` `Audit` instance list
-        :yield Generator[dict, None, None]: dictionary with a chat event
+        :param list[Audit] audit: `ZenPy` `Audit` instance list, or its `ZDBC.partition_events`
+        :return list[dict]: list of chat event dictionaries
         """
-        return (
-            history for audit in audits
-            for event in audit.events
-                if event['type'] == 'ChatStartedEvent'
-            for history in ZDBC.format_chat_history(event, ticket_id)
-        )
+        chat_events = ZDBC.partition_events(audits).by_type.get('ChatStartedEvent', ())
+        return list(chain.from_iterable(ZDBC.extract_chat_history_from_event(ticket_id, event) for _, event in chat_events))
 
     @staticmethod
-    def extract_chat_history_from_event(ticket_id: int, event: dict) -> Generator[dict, None, None]:
+    def extract_chat_history_from_event(ticket_id: int, event: dict) -> list[dict]:
         """Extracts chat history from given event
 
         :param int ticket_id: ID of tikcet that originates the event
         :param dict event: event from `audit.events`
-        :yield Generator[dict, None, None]: generator for chat dictionaries
+        :return list[dict]: list of chat dictionaries
         """
-        return (
+        event_id = event['id']
+        id_prefix = f"{event_id}-"
+        return [
             {
                 "ticket_id": ticket_id,
-                "id": f"{event['id']}-{idx}",
+                "id": id_prefix + str(idx),
                 "content": history,
-                "chat_id": event['id']
+                "chat_id": event_id
             }
             for idx, history in enumerate(event['value']['history'])
                 if history['type'] == "ChatMessage"
-        )
+        ]
 
     @staticmethod
-    def extract_sla_history(ticket_id: int, audits: list[Audit]) -> Generator[dict, None, None]:
+    def extract_sla_history(ticket_id: int, audits: list[Audit]) -> list[dict]:
         """Extracts SLA history from givent Audits list
 
         :param int ticket_id: ID of the ticket that originates the audits
-        :param list[Audit] audits: list of audits from ticket with `ticket_id`
-        :yield Generator[dict, None, None]: dictionary with SLA events
+        :param list[Audit] audits: list of audits from ticket with `ticket_id`, or its `ZDBC.partition_events`
+        :return list[dict]: list of SLA event dictionaries
         """
-        return (
-            ZDBC.format_event(ticket_id=ticket_id, event=event, audit=audit)
-            for audit in audits
-                for event in audit.events
-                    if ZDBC.is_sla_change(event)
-        )
+        history = []
+        append = history.append
+        for audit, event in ZDBC.partition_events(audits).by_type.get(_CHANGE, ()):
+            via = event.get('via')
+            if via is not None and via['source'].get('rel') == _SLA_TARGET_CHANGE:
+                append(ZDBC.format_event(ticket_id=ticket_id, event=event, audit=audit))
+        return history
 
     @staticmethod
     def is_sla_change(event: dict) -> bool:
@@ -184,11 +431,10 @@ class ZDBC:
         :param dict event: event dictionary from `audit.events`
         :return bool: True if event is an SLA change
         """
-        return (
-            (event['type'] == 'Change')
-            and ('via' in event)
-            and (event['via']['source']['rel'] == 'sla_target_change')
-        )
+        if event.get('type') != _CHANGE:
+            return False
+        via = event.get('via')
+        return via is not None and via['source'].get('rel') == _SLA_TARGET_CHANGE
 
     @staticmethod
     def format_event(ticket_id: int, audit: Audit, event: dict) -> dict:
@@ -200,7 +446,7 @@ class ZDBC:
         :return dict:
         """
         return {
-            **dict(x for x in event.items() if x[0]!='previous_value'),
+            **{k: v for k, v in event.items() if k != 'previous_value'},
             'id': f"{audit.id}-{event['id']}",
             'event_id': event['id'],
             'audit_id': audit.id,
@@ -208,44 +454,5 @@ class ZDBC:
             'changed_at': audit.created_at
         }
 
-    @staticmethod
-    def flatten_dict(d: dict, key: str|list[str]) -> dict:
-        """Recusively flattens a dictionary (dictionaries inside of dictionaries are also flattened).
-
-        Lists with dictionaries are turned into dicts with keys using `key`.
-
-        If `key` is a list, it attempts to use each item from the list in order as a key.
-
-        :param dict d: dictionary to be flattened
-        :param str | list[str] key: key or keys to be used in keying lists of dictionaries
-        :return dict: flatenned dictionary
-        """
-        return { k: ZDBC.flatten_dict_list(v, key) for k, v in d.items() }
-
-    @staticmethod
-    def flatten_dict_list(dlist: list[dict], key: str|list[str]) -> dict:
-        """Flattens list of dictionaries recursively
-
-        :param list[dict] dlist: list of dictionaries
-        :param str | list[str] key: key(s) to be extrated from the dictionaries and turned into dict keys
-        :return dict: flattened dictionary
-        """
-        wrong_type = lambda x: type(x)!=list and type(x)!=dict
-
-        if wrong_type(dlist) or (type(dlist)==list and len(dlist) > 0 and wrong_type(dlist[0])):
-            return dlist
-
-        if type(dlist)==dict:
-            return flatten_dict(dlist, key)
-
-        def choose_key(d: dict) -> str:
-            if type(key)==str: return key
-            for k in key:
-                if k in d: return k
-
-        flattened = { d[choose_key(d)]: ZDBC.flatten_dict_list(d, key) for d in dlist }
-
-        for v in flattened.values():
-            v.pop(choose_key(v))
-
-        return flattened
+    flatten_dict = staticmethod(_flatten.flatten_dict)
+    flatten_dict_list = staticmethod(_flatten.flatten_dict_list)
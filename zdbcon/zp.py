@@ -1,11 +1,37 @@
+from __future__ import annotations
+import asyncio
 import pyodbc as db
-import pandas as pd
 from dateutil import parser as date_parser
 from dateutil import tz
-from zenpy import Zenpy
-from zenpy.lib.api_objects import Ticket
 from datetime import datetime, timedelta
-from icecream import ic
+from typing import Callable, Iterable, TYPE_CHECKING
+from functools import lru_cache
+import time
+from zdbcon import _flatten
+
+if TYPE_CHECKING:
+    from zenpy import Zenpy
+    from zenpy.lib.api_objects import Ticket
+
+_LOCAL_TZ = tz.tzlocal()
+_RECONNECT_ERRORS = (db.OperationalError, db.InterfaceError)
+_DATE_TYPES = frozenset({'datetime', 'date'})
+_SQL_QUOTE_TRANSLATE = str.maketrans("'", '"')
+
+@lru_cache(maxsize=None)
+def _value_kind(sql_type: str) -> str:
+    """Kind of value conversion used by `Zendesk.parse_value` and `Zendesk.bind_value` for the SQL type. Memoized per type.
+
+    :param str sql_type: SQL data type
+    :return str: one of `'date'`, `'bit'`, `'int'` or `'text'`
+    """
+    if sql_type in _DATE_TYPES:
+        return 'date'
+    if sql_type == 'bit':
+        return 'bit'
+    if 'int' in sql_type:
+        return 'int'
+    return 'text'
 
 class Zendesk:
     PandasTypeMap = {
@@ -14,7 +40,14 @@ class Zendesk:
         "bool": "bit",
     }
 
-    def __init__(self, table: str, credentials: dict[str, str], type_mapping: dict[str, dict[str,str]]={}, logger=ic):
+    PythonTypeMap = {
+        bool: "bool",
+        int: "int64",
+        float: "float64",
+        datetime: "datetime64[ns]",
+    }
+
+    def __init__(self, table: str, credentials: dict[str, str], type_mapping: dict[str, dict[str,str]]={}, logger=None):
         """Zenpy wrapper that connects the API to a pyodbc SQL Database
 
         Example `credentials` for Zendesk:
@@ -69,16 +102,20 @@ class Zendesk:
         :param str table: table name
         :param dict[str, str] credentials: Zendesk API credentials
         :param dict[str, dict[str,str]] type_mapping: type mapping dictionary, defaults to {}
-        :param Callable logger: logging function, defaults to `ic`
+        :param Callable logger: logging function, defaults to None and uses `icecream.ic`
         """
         self.connect_zendesk(credentials)
         self.mapping_dict: dict = type_mapping
+        self._direct_map: dict = type_mapping.get('direct', {})
+        self._date_map: set[str] = set(type_mapping.get('date_fields', []))
+        self._except_map: dict = type_mapping.get('except', {})
 
         self.table = table
         self.table_columns: set[str] = set()
         self.VERBOSE = False
         self.id_cache = None
         self.logger = logger
+        self._field_title_cache: dict[int, str] = {}
 
     def reconnect(self):
         """Attempts to reconnect to the database and to Zendesk
@@ -92,59 +129,28 @@ class Zendesk:
         :param dict obj_dict: dictionary
         :return list[dict[str, any]]: list of dictionaries
         """
-        df = pd.json_normalize(obj_dict)
-        pd_types = df.dtypes.to_dict()
         return [
             {
                 'column': key,
                 'value': val,
-                'type': self.map_type(key, str(pd_types[key]))
+                'type': self.map_type(key, Zendesk._py_to_pd_dtype(val))
             }
-            for key, val in df.iloc[0].to_dict().items()
+            for key, val in Zendesk._normalise_json(obj_dict).items()
                 if val is not None
         ]
 
     @staticmethod
-    def flatten_dict(d: dict, key: str|list[str]) -> dict:
-        """Recusively flattens a dictionary (dictionaries inside of dictionaries are also flattened).
-
-        Lists with dictionaries are turned into dicts with keys using `key`.
-
-        If `key` is a list, it attempts to use each item from the list in order as a key.
-
-        :param dict d: dictionary to be flattened
-        :param str | list[str] key: key or keys to be used in keying lists of dictionaries
-        :return dict: flatenned dictionary
-        """
-        return { k: Zendesk.flatten_dict_list(v, key) for k, v in d.items() }
-
-    @staticmethod
-    def flatten_dict_list(dlist: list[dict], key: str|list[str]) -> dict:
-        """Flattens list of dictionaries recursively
+    def _py_to_pd_dtype(value: any) -> str:
+        """Pandas datatype string that `pandas` would infer for a single Python value.
 
-        :param list[dict] dlist: list of dictionaries
-        :param str | list[str] key: key(s) to be extrated from the dictionaries and turned into dict keys
-        :return dict: flattened dictionary
+        :param any value: python value
+        :return str: pandas datatype string, `'object'` if type is not in `Zendesk.PythonTypeMap`
         """
-        wrong_type = lambda x: type(x)!=list and type(x)!=dict
-
-        if wrong_type(dlist) or (type(dlist)==list and len(dlist) > 0 and wrong_type(dlist[0])):
-            return dlist
-
-        if type(dlist)==dict:
-            return Zendesk.flatten_dict(dlist, key)
+        return Zendesk.PythonTypeMap.get(type(value), 'object')
 
-        def choose_key(d: dict) -> str:
-            if type(key)==str: return key
-            for k in key:
-                if k in d: return k
-
-        flattened = { d[choose_key(d)]: Zendesk.flatten_dict_list(d, key) for d in dlist }
-
-        for v in flattened.values():
-            v.pop(choose_key(v))
-
-        return flattened
+    _normalise_json = staticmethod(_flatten.normalise_json)
+    flatten_dict = staticmethod(_flatten.flatten_dict)
+    flatten_dict_list = staticmethod(_flatten.flatten_dict_list)
 
     def connect_zendesk(self, credentials: dict[str, str]):
         """
@@ -166,8 +172,14 @@ class Zendesk:
 
         :param dict[str, str] credentials: JSON string with Zendesk API credential information
         """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from zenpy import Zenpy
+
         self.credentials: dict[str, str] = credentials
-        self.client: Zenpy = Zenpy(**self.credentials)
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16, **Zenpy.http_adapter_kwargs()))
+        self.client: Zenpy = Zenpy(**self.credentials, session=session)
 
     def connect_db(self, db_credentials: str) -> db.Connection:
         """Connects to SQL database using pyodbc.
@@ -190,17 +202,16 @@ class Zendesk:
         """
         self.db_credentials = db_credentials
         self.db = db.connect(self.db_credentials)
+        self._cursor: db.Cursor = self.db.cursor()
         return self.db
 
-    def sql_update_str(self, type_list: list[dict[str, any]], id: str) -> str:
-        """Creates SQL query to update row with `id` using values from the `Zendesk.type_list` function
+    def sql_update_str(self, columns: Iterable[str]) -> str:
+        """Creates parameterized SQL query to update a row, with a `?` placeholder for each column followed by one for the row ID.
 
-        :param list[dict[str, any]] type_list: output from type_list function
-        :param str id: row ID
+        :param Iterable[str] columns: names of the columns to be updated
         :return str: SQL query
         """
-        parsed_values: dict[str, str] = dict(map(Zendesk.parse_value, type_list))
-        return f"update {self.table} set {', '.join([f'[{c}]={v}' for c, v in parsed_values.items()])} where id={id if type(id)==int else f"'{id}'"}"
+        return f"update {self.table} set [{']=?, ['.join(columns)}]=? where id=?"
 
     def sql_insertion_str(self, columns: str, values: str) -> str:
         """Inserts new row into table.
@@ -217,86 +228,105 @@ class Zendesk:
         :param str table: name of the table to check for
         :return bool: True if table exists
         """
-        return bool(self.db.cursor().tables(table=table, tableType='TABLE').fetchone())
+        return bool(self._cursor.tables(table=table, tableType='TABLE').fetchone())
 
     def add_columns(self, type_list: list[dict[str, str]]):
-        """Adds columns to the table `self.table` using the given `type_list`.
+        """Adds the missing columns from `type_list` to the table `self.table`, in a single `alter table` statement.
 
         :param list[dict[str, str]] type_list: output from the `Zendesk.type_list` function
         """
-        for t in type_list:
-            col_name, col_type = t['column'], t['type']
-            if not self.has_column(col_name):
-                self.vp(f'Column {col_name} ({col_type}) does not exist, adding it now.')
-                self.add_column(col_name, col_type)
-                self.cache_table_columns()
+        missing: dict[str, str] = {t['column']: t['type'] for t in type_list if not self.has_column(t['column'])}
+        if not missing:
+            return
+        self.vp(f'Columns {missing} do not exist, adding them now.')
+        self.execute(f"alter table [{self.table}] add {', '.join(f'[{c}] {t} NULL' for c, t in missing.items())}")
+        self.db.commit()
+        self.table_columns.update(missing)
 
-    @staticmethod
-    def _normalized_fields(dlist: list[dict[str, any]]) -> dict[int, any]:
-        """Normalizes the Zendesk fields data.
+    _normalized_fields = staticmethod(_flatten.normalized_fields)
 
-        :param list[dict[str, any]] dlist: list of fields
-        :return dict[int, any]: normalized (flattened) dictionary
-        """
-        if not dlist: return {}
-        return { f['id']:f['value'] for f in dlist }
-    
     def vp(self, txt: str):
         """Verbose print.
         Only prints if `self.VERBOSE` is `True`
 
         :param str txt: text to be passed onto `logger`, (`ic` by default)
         """
-        if self.VERBOSE: self.logger(txt)
-
-    def commit(self, tries=10):
+        if self.VERBOSE:
+            if self.logger is None:
+                from icecream import ic
+                self.logger = ic
+            self.logger(txt)
+
+    def _with_reconnect(self, action: Callable, tries: int, name: str):
+        """Calls `action`, retrying up to `tries` times after connection-level errors (`pyodbc.OperationalError`, `pyodbc.InterfaceError`).
+
+        Before each retry it waits with exponential backoff and reconnects to the database. The last attempt raises on failure.
+        Other `pyodbc.Error`s (e.g. `IntegrityError`, `DataError`, `ProgrammingError`) are deterministic and are raised immediately.
+
+        :param Callable action: function to call, must read `self.db`/`self._cursor` when called so retries use the new connection
+        :param int tries: number of times to retry
+        :param str name: name of the operation, for the verbose log
+        :return any: return of `action`
+        """
+        for attempt in range(tries):
+            try:
+                r = action()
+                if attempt:
+                    self.vp(f">   {name} successful to {self.table}")
+                return r
+            except _RECONNECT_ERRORS as pe:
+                self.vp(f">   Error: {pe}")
+                self.vp(f'>   Retrying {name} to {self.table} ({tries - attempt} attempts left)')
+                time.sleep(min(2 ** attempt, 30))
+                try:
+                    self.reconnect()
+                except Exception as ce:
+                    self.vp(f">   Couldn't reconnect to {self.table}: {ce}")
+        return action()
+
+    def commit(self):
         """Wrapper for pyodbc `Connection.commit`
 
-        While unsuccessful:
-        - reconnects to the database
-        - retries `tries` number of times.
-
-        :param int tries: number of times to retry the commit, defaults to 10
+        Errors are not retried: after a reconnect the pending statements are gone, so committing on the new connection
+        would report success for lost work. Callers replay their unit of work instead.
         """
-        try:
-            self.db.commit()
-        except db.Error as pe:
-            self.vp(f"Error: {pe}")
-            self.vp('Retrying commit')
-            try:
-                self.reconnect()
-                self.commit(tries - 1)
-            except:
-                self.vp("Couldn't reconnect")
+        self.db.commit()
 
-    def execute(self, sql_query: str, tries=10, is_first=True):
+    def execute(self, sql_query: str, params: tuple=(), tries=10):
         """Executes the given SQL query.
 
         Returns result of query includes a `SELECT`.
 
-        :param str sql_query: SQL query
+        On connection errors, reconnects to the database and retries `tries` number of times (see `Zendesk._with_reconnect`).
+
+        :param str sql_query: SQL query, optionally with `?` placeholders
+        :param tuple params: values bound to the query placeholders, defaults to ()
         :param int tries: number of times to retry, defaults to 10
-        :param bool is_first: used by the recursion algorithm to determine first run, defaults to True
-        :return list|None: same return as `Connection.execute`
+        :return db.Cursor: the cached cursor, as returned by `Cursor.execute`
         """
         self.vp(f'> Executing SQL query to {self.table}')
+        return self._with_reconnect(lambda: self._cursor.execute(sql_query, *params), tries, 'Execute')
 
-        if tries==0:
-            return self.db.execute(sql_query)
+    def executemany(self, sql_query: str, params: list[tuple], tries=10):
+        """Executes the given parameterized SQL query once for each tuple in `params`.
 
-        try:
-            r = self.db.execute(sql_query)
-            if not is_first:
-                self.vp(f">   Execute successful to {self.table}")
-            return r
-        except db.Error as pe:
-            self.vp(f">   Error: {pe}")
-            try:
-                self.vp(f'>   Retrying execute to {self.table} ({tries} attempts left)')
-                return self.execute(sql_query, tries - 1, False)
-            except:
-                self.vp(f">   Couldn't execute to {self.table}")
-                return
+        Uses pyodbc's `fast_executemany`, so all rows are sent to the server in a single round trip.
+        The rows succeed or fail together: one invalid row (e.g. a value that doesn't fit its column) raises for the whole batch.
+
+        On connection errors, reconnects to the database and retries `tries` number of times (see `Zendesk._with_reconnect`).
+        A reconnect discards any uncommitted statements, so commit pending work before calling it.
+
+        :param str sql_query: SQL query with `?` placeholders
+        :param list[tuple] params: parameters for each execution
+        :param int tries: number of times to retry, defaults to 10
+        """
+        self.vp(f'> Executing SQL query to {self.table} ({len(params)} rows)')
+
+        def execute_batch():
+            self._cursor.fast_executemany = True
+            self._cursor.executemany(sql_query, params)
+
+        self._with_reconnect(execute_batch, tries, 'Executemany')
 
     def map_type(self, column: str, pd_type: str) -> str:
         """Maps column with Pandas datatype to SQL datatype.
@@ -305,24 +335,26 @@ class Zendesk:
         :param str pd_type: datatype assigned by Pandas
         :return str: string for SQL data type
         """
-        direct_map: dict = self.mapping_dict['direct']
-        date_map: dict = self.mapping_dict['date_fields']
-        except_map: dict = self.mapping_dict['except']
-
-        if column in date_map or column[-3:] == '_at':
+        if column in self._date_map or column.endswith('_at'):
             return 'datetime'
-        if pd_type in direct_map:
-            return direct_map[pd_type]
-        if column in except_map:
-            return except_map[column]
+        if pd_type in self._direct_map:
+            return self._direct_map[pd_type]
+        if column in self._except_map:
+            return self._except_map[column]
         return pd_type
 
+    def field_title(self, field_id: int) -> str:
+        """Title of the ticket field with `field_id`. Memoized, so the Zendesk API is only requested once per field.
+
+        :param int field_id: ID of the ticket field
+        :return str: ticket field title
+        """
+        if field_id not in self._field_title_cache:
+            self._field_title_cache[field_id] = self.client.ticket_fields(id=field_id).title
+        return self._field_title_cache[field_id]
+
     def translated_custom_fields(self, ticket: Ticket) -> dict[str, str]:
-        tdict = ticket.to_dict()
-        custom_fields: dict[str, str|int|float] = {}
-        for f in tdict['custom_fields']:
-            custom_fields[self.client.ticket_fields(id=f['id']).title] = f['value']
-        return custom_fields
+        return { self.field_title(f['id']): f['value'] for f in ticket.to_dict()['custom_fields'] }
 
     def append_obj(self, obj_dict: dict, recache=True, force=False) -> bool:
         """Appends generic dictionary to table.
@@ -336,7 +368,8 @@ class Zendesk:
         """
         id=obj_dict['id']
         type_list = self.type_list(obj_dict)
-        if id in self.get_table_ids(recache=recache, type_list=type_list):
+        table_ids = self.get_table_ids(recache=recache, type_list=type_list)
+        if id in table_ids:
             self.vp(f"{obj_dict['id']} already in {self.table}")
             if not force:
                 return False
@@ -344,19 +377,74 @@ class Zendesk:
 
         self.add_columns(type_list)
 
-        columns, values = self.sql_columns_and_values(type_list)
+        bound_values: dict[str, any] = dict(map(Zendesk.bind_value, type_list))
+        columns, values = self.sql_columns_and_values(bound_values)
 
         sql_query = self.sql_insertion_str(columns, values)
+        params = tuple(bound_values.values())
 
-        if id in self.get_table_ids(recache):
-            sql_query = self.sql_update_str(type_list, id)
+        if id in table_ids:
+            sql_query = self.sql_update_str(bound_values)
+            params = (*params, id)
 
         self.id_cache.add(obj_dict['id'])
 
-        self.execute(sql_query=sql_query)
+        self.execute(sql_query=sql_query, params=params)
         self.commit()
         return True
 
+    def append_many(self, rows: list[dict], recache=False, force=False, chunk_size=1000) -> int:
+        """Appends list of generic dictionaries to table using parameterized `executemany` inserts.
+
+        Rows with IDs that already exist in the table are skipped, unless `force` is `True`, in which case they are updated.
+
+        Forced updates are committed together, and each insert chunk is committed on its own, so a chunk retried after a
+        reconnect never depends on uncommitted work from the lost connection. Only IDs of committed rows are added to `self.id_cache`.
+
+        :param list[dict] rows: dictionaries to be appended
+        :param bool recache: whether to recache table ids, defaults to False
+        :param bool force: update rows with IDs already in the table, defaults to False
+        :param int chunk_size: max number of rows sent per `executemany` call, an invalid row fails its whole chunk, defaults to 1000
+        :return int: number of appended or updated rows
+        """
+        if not rows:
+            return 0
+
+        type_lists = {row['id']: self.type_list(row) for row in rows}
+        table_ids = self.get_table_ids(recache=recache, type_list=next(iter(type_lists.values())))
+
+        column_types: dict[str, dict] = {}
+        for type_list in type_lists.values():
+            for t in type_list:
+                column_types.setdefault(t['column'], t)
+        self.add_columns(list(column_types.values()))
+
+        updated = 0
+        new_ids: list = []
+        new_values: list[tuple] = []
+        for id, type_list in type_lists.items():
+            bound_values: dict[str, any] = dict(map(Zendesk.bind_value, type_list))
+            if id in table_ids:
+                self.vp(f"{id} already in {self.table}")
+                if force:
+                    self.execute(sql_query=self.sql_update_str(bound_values), params=(*bound_values.values(), id), tries=0)
+                    updated += 1
+                continue
+            new_ids.append(id)
+            new_values.append(tuple(bound_values.get(c) for c in column_types))
+
+        if updated:
+            self.commit()
+
+        columns = f"[{'], ['.join(column_types)}]"
+        sql_query = self.sql_insertion_str(columns, ', '.join('?' * len(column_types)))
+        for i in range(0, len(new_values), chunk_size):
+            self.executemany(sql_query, new_values[i:i + chunk_size])
+            self.commit()
+            self.id_cache.update(new_ids[i:i + chunk_size])
+
+        return updated + len(new_values)
+
     @staticmethod
     def iso_date_to_datetime(iso_date: str) -> datetime:
         """Converts Zendesk's [ISO date format](https://developer.zendesk.com/api-reference/introduction/requests/) to `datetime` type.
@@ -364,17 +452,20 @@ class Zendesk:
         :param str iso_date: ISO date string
         :return datetime: 
         """
-        return date_parser.parse(iso_date).astimezone(tz.tzlocal())
+        try:
+            d = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+        except ValueError:
+            d = date_parser.parse(iso_date)
+        return d.astimezone(_LOCAL_TZ)
 
     def create_table(self, type_list: list[dict[str, str]]):
         """Creates table `table` using `type_list` for column names and types.
 
         :param list[dict[str, str]] type_list: list of dictionaries with `column` and `type` keys
         """
-        cursor = self.db.cursor()
-        columns = ', '.join([f'[{t['column']}] {t['type']}' for t in type_list])
-        cursor.execute(f'CREATE TABLE [{self.table}]({columns})')
-        cursor.commit()
+        columns = ', '.join(f'[{t['column']}] {t['type']}' for t in type_list)
+        self._cursor.execute(f'CREATE TABLE [{self.table}]({columns})')
+        self._cursor.commit()
         self.connect_zendesk(self.credentials)
     
     def alter_fields(self, type_list: list[dict[str, str]]):
@@ -389,6 +480,7 @@ class Zendesk:
     def end_db_connection(self):
         self.db.close()
     
+    ID_FETCH_SIZE = 10_000
     def get_table_ids(self, recache=True, type_list: list[dict]=[]) -> set[int]:
         """Retrieves ID column from given table.
 
@@ -399,15 +491,24 @@ class Zendesk:
         if recache or self.id_cache is None:
             try:
                 ids = self.execute(f'select [id] from [{self.table}]')
-                self.id_cache = set(i[0] for i in ([] if ids is None else ids.fetchall()))
+                table_ids: set[int] = set()
+                while ids is not None and (rows := ids.fetchmany(Zendesk.ID_FETCH_SIZE)):
+                    table_ids.update(r[0] for r in rows)
+                self.id_cache = table_ids
             except db.Error as ex:
-                error_code = ex.args[0]
-                if error_code == '42S02':
-                    self.create_table(type_list=type_list)
+                if ex.args[0] != '42S02':
+                    raise
+                self.create_table(type_list=type_list)
+                self.id_cache = set()
         return self.id_cache
 
-    def sql_columns_and_values(self, type_list: list[dict[str, str]]) -> tuple[str, str]:
-        return f"[{'], ['.join([t['column'] for t in type_list])}]", ', '.join(dict(map(Zendesk.parse_value, type_list)).values())
+    def sql_columns_and_values(self, bound_values: dict[str, any]) -> tuple[str, str]:
+        """Column list and matching `?` placeholders for a parameterized insert of `bound_values`.
+
+        :param dict[str, any] bound_values: column names and their values from `Zendesk.bind_value`
+        :return tuple[str, str]: columns and placeholders, to be passed to `Zendesk.sql_insertion_str`
+        """
+        return f"[{'], ['.join(bound_values)}]", ', '.join('?' * len(bound_values))
 
     @staticmethod
     def parse_value(data: dict) -> tuple[str, str]:
@@ -420,21 +521,49 @@ class Zendesk:
         """
         c = data['column']
         v = data['value']
-        t = data['type']
 
-        if (v is None) or (type(v)==str and len(v)==0):
+        if (v is None) or (isinstance(v, str) and len(v)==0):
             return (c, 'NULL')
-        if t in {'datetime', 'date'}:
+        kind = _value_kind(data['type'])
+        if kind == 'date':
             try:
                 d = Zendesk.iso_date_to_datetime(v).strftime('%Y-%m-%d %H:%M:%S')
                 return (c, f"'{d}'")
             except:
                 return (c, 'NULL')
-        if t == 'bit':
+        if kind == 'bit':
             return (c, str(int(v)))
-        if 'int' in t:
+        if kind == 'int':
             return (c, f'{v}')
-        return (c, f"N'{str(v).replace("'", '"')}'")
+        return (c, f"N'{str(v).translate(_SQL_QUOTE_TRANSLATE)}'")
+
+    @staticmethod
+    def bind_value(data: dict) -> tuple[str, any]:
+        """Converts python values into values that can be bound to `?` query parameters.
+
+        Same conversions as `Zendesk.parse_value`, but values are not turned into SQL literals.
+
+        Expects dictionary with `column`, `value` and `type` keys.
+
+        :param dict[str, str] data: original python data
+        :return tuple[str, any]: tuple of column name and parameter value
+        """
+        c = data['column']
+        v = data['value']
+
+        if (v is None) or (isinstance(v, str) and len(v)==0):
+            return (c, None)
+        kind = _value_kind(data['type'])
+        if kind == 'date':
+            try:
+                return (c, Zendesk.iso_date_to_datetime(v).replace(tzinfo=None, microsecond=0))
+            except:
+                return (c, None)
+        if kind == 'bit':
+            return (c, int(v))
+        if kind == 'int':
+            return (c, v)
+        return (c, str(v))
 
     def cache_table_columns(self):
         """Caches table columns from SQL database
@@ -453,8 +582,14 @@ class Zendesk:
         return column_name in self.get_table_columns()
 
     def add_column(self, col_name: str, col_type: str):
+        """Adds nullable column to `self.table` and to the cached `self.table_columns`.
+
+        :param str col_name: column name
+        :param str col_type: SQL data type
+        """
         self.execute(f'alter table [{self.table}] add [{col_name}] {col_type} NULL')
         self.db.commit()
+        self.table_columns.add(col_name)
 
     DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
     def get_tickets(self, updated_at_after: str):
@@ -475,6 +610,28 @@ class Zendesk:
             sort_order='asc'
         )
 
+    def get_tickets_parallel(self, updated_at_after: str, sem_limit=8) -> list[dict]:
+        """Same search as `Zendesk.get_tickets`, but the result pages are requested concurrently and returned as ticket dictionaries.
+
+        Zendesk caps searches at 1000 results (`zdbcon.async_client.SEARCH_MAX_RESULTS`): if more tickets were updated after
+        `updated_at_after`, a `ValueError` is raised. Use a later `updated_at_after` to page through them.
+
+        See `zdbcon.async_client.fetch_search_results`.
+
+        :param str updated_at_after: date string in the format `"%Y-%m-%d %H:%M:%S"`
+        :param int sem_limit: max number of concurrent requests, defaults to 8
+        :raises ValueError: if the search matches more than 1000 tickets
+        :return list[dict]: ticket dictionaries, sorted by `updated_at` in ascending order
+        """
+        from zdbcon.async_client import fetch_search_results
+
+        updated_at = datetime.strptime(updated_at_after, Zendesk.DATE_FORMAT)
+        return asyncio.run(fetch_search_results(self.credentials, {
+            'query': f'type:ticket updated_at>{updated_at:%Y-%m-%dT%H:%M:%SZ}',
+            'sort_by': 'updated_at',
+            'sort_order': 'asc'
+        }, sem_limit=sem_limit))
+
     def single_ticket_fetch(self, updated_at_after: str) -> Ticket:
         """Returns first ticket with `updated_at` date after given `updated_at_after` date.
 
@@ -489,8 +646,12 @@ class Zendesk:
     def get_deleted_tickets(self):
         return self.client.tickets.deleted(sort_by='deleted_at', sort_order='asc')
 
-    def select_tickets_open_for_over(self, days=30) -> pd.DataFrame:
-        return pd.read_sql_query(
-            f"SELECT id FROM ZENDESK.DBO.Tickets WHERE DATEDIFF(DD, created_at, GETDATE()) > {days} AND [status]!='closed'",
-            self.db
-        )
+    def select_tickets_open_for_over(self, days=30) -> list[int]:
+        """IDs of the tickets in the database that are not closed and were created over `days` days ago.
+
+        :param int days: number of days, defaults to 30
+        :return list[int]: ticket IDs
+        """
+        return [r[0] for r in self.execute(
+            f"SELECT id FROM ZENDESK.DBO.Tickets WHERE DATEDIFF(DD, created_at, GETDATE()) > {days} AND [status]!='closed'"
+        ).fetchall()]